@@ -1,4 +1,7 @@
 # Display utility functions for OLED
+import framebuf
+import time
+from machine import Pin
 from ssd1306 import SSD1306_I2C
 
 
@@ -39,6 +42,11 @@ class DisplayManager:
 
     def show_weather_data(self, temp, hum, wifi_rssi, wlan):
         """Display weather station data"""
+        ip = wlan.ifconfig()[0] if wlan.isconnected() else None
+        self.show_weather_values(temp, hum, wifi_rssi, ip)
+
+    def show_weather_values(self, temp, hum, wifi_rssi, ip):
+        """Display weather station data without touching the WiFi chip"""
         self.display.fill(0)
 
         # Title
@@ -53,15 +61,14 @@ class DisplayManager:
         self.display.text(f"Hum:  {hum_str}", 0, 26)
 
         # WiFi status
-        if wlan.isconnected():
+        if ip:
             self.display.text(f"WiFi: {wifi_rssi}dBm", 0, 36)
         else:
             self.display.text("WiFi: Disconnected", 0, 36)
 
         # IP Address
-        if wlan.isconnected():
-            ip = wlan.ifconfig()[0].strip()
-            self.display.text(f"IP:{ip}", 0, 46)
+        if ip:
+            self.display.text(f"IP:{ip.strip()}", 0, 46)
 
         self.display.show()
 
@@ -79,3 +86,189 @@ class DisplayManager:
         self.display.text("Check config!", 15, 52)
 
         self.display.show()
+
+
+class SparklineScreen:
+    """Scrolling temperature and humidity history, rendered incrementally"""
+
+    PLOT_WIDTH = 96  # Columns 96-127 hold the current values
+    PLOT_HEIGHT = 32  # Temperature on pages 0-3, humidity on pages 4-7
+
+    def __init__(self, display):
+        self.display = display
+        self.temps = []
+        self.hums = []
+        self.temp_range = None
+        self.hum_range = None
+        self.labels = None
+        # Strided views over the plot areas, so scroll() leaves the labels alone
+        self.temp_plot = self._plot_view(0)
+        self.hum_plot = self._plot_view(4)
+
+    def _plot_view(self, page):
+        buf = memoryview(self.display.buffer)[page * self.display.width :]
+        return framebuf.FrameBuffer(
+            buf,
+            self.PLOT_WIDTH,
+            self.PLOT_HEIGHT,
+            framebuf.MONO_VLSB,
+            self.display.width,
+        )
+
+    def add_sample(self, temp, hum, visible=True):
+        """Record a sample, scrolling it onto the panel if the screen is shown"""
+        for history, value in ((self.temps, temp), (self.hums, hum)):
+            history.append(value)
+            if len(history) > self.PLOT_WIDTH:
+                history.pop(0)
+
+        if not visible:
+            return
+
+        # A value outside the current scale means the whole plot must move
+        if not (
+            self._in_range(temp, self.temp_range)
+            and self._in_range(hum, self.hum_range)
+        ):
+            self.render()
+            return
+
+        x = self.PLOT_WIDTH - 1
+        for plot, history, rng in (
+            (self.temp_plot, self.temps, self.temp_range),
+            (self.hum_plot, self.hums, self.hum_range),
+        ):
+            plot.scroll(-1, 0)
+            prev = history[-2] if len(history) > 1 else history[-1]
+            self._draw_column(plot, x, prev, history[-1], rng)
+
+        # Labels only need pushing when their text changes
+        if self._draw_labels(temp, hum):
+            self.display.show_region(0, self.display.width - 1)
+        else:
+            self.display.show_region(0, x)
+
+    def render(self):
+        """Redraw the whole screen from history"""
+        self.display.fill(0)
+        self.temp_range = self._scale(self.temps)
+        self.hum_range = self._scale(self.hums)
+
+        count = len(self.temps)
+        start = self.PLOT_WIDTH - count
+        for plot, history, rng in (
+            (self.temp_plot, self.temps, self.temp_range),
+            (self.hum_plot, self.hums, self.hum_range),
+        ):
+            for i in range(count):
+                prev = history[i - 1] if i else history[i]
+                self._draw_column(plot, start + i, prev, history[i], rng)
+
+        self.labels = None
+        if count:
+            self._draw_labels(self.temps[-1], self.hums[-1])
+        self.display.show()
+
+    def _draw_labels(self, temp, hum):
+        """Draw current values beside the plots, return True if they changed"""
+        labels = (self._format(temp), self._format(hum))
+        if labels == self.labels:
+            return False
+        self.labels = labels
+
+        x = self.PLOT_WIDTH
+        self.display.fill_rect(x, 0, self.display.width - x, self.display.height, 0)
+        self.display.text(labels[0], x, 8)
+        self.display.text("C", x + 12, 18)
+        self.display.text(labels[1], x, 40)
+        self.display.text("%", x + 12, 50)
+        return True
+
+    def _draw_column(self, plot, x, prev, value, rng):
+        """Draw one sparkline column joining the previous sample to this one"""
+        plot.vline(x, 0, self.PLOT_HEIGHT, 0)
+        y0 = self._to_y(prev, rng)
+        y1 = self._to_y(value, rng)
+        plot.vline(x, min(y0, y1), abs(y1 - y0) + 1, 1)
+
+    def _to_y(self, value, rng):
+        low, high = rng
+        top = self.PLOT_HEIGHT - 1
+        return top - int((value - low) * top / (high - low))
+
+    @staticmethod
+    def _scale(history):
+        """Plot range with a margin, so small changes scroll incrementally"""
+        if not history:
+            return (0.0, 1.0)
+        return (min(history) - 1.0, max(history) + 1.0)
+
+    @staticmethod
+    def _in_range(value, rng):
+        return rng is not None and rng[0] <= value <= rng[1]
+
+    @staticmethod
+    def _format(value):
+        # Four characters fit beside the plot
+        text = f"{value:.1f}"
+        return text if len(text) <= 4 else f"{value:.0f}"
+
+
+class ScreenCarousel:
+    """Cycles between the weather and graph screens on a button or timer"""
+
+    WEATHER = 0
+    GRAPH = 1
+
+    def __init__(self, display_manager, interval_ms=10000, button_pin=None):
+        self.display_manager = display_manager
+        self.graph = SparklineScreen(display_manager.display)
+        self.interval_ms = interval_ms
+        self.screen = self.WEATHER
+        self.reading = None
+        self.pressed = False
+        self.last_press = 0
+        self.last_switch = time.ticks_ms()
+
+        if button_pin is not None:
+            self.button = Pin(button_pin, Pin.IN, Pin.PULL_UP)
+            self.button.irq(trigger=Pin.IRQ_FALLING, handler=self._on_press)
+
+    def _on_press(self, pin):
+        # Debounce in the IRQ, the switch itself happens in update()
+        now = time.ticks_ms()
+        if time.ticks_diff(now, self.last_press) > 200:
+            self.last_press = now
+            self.pressed = True
+
+    def add_reading(self, temp, hum, wifi_rssi, ip):
+        """Record a sample and refresh whichever screen is showing"""
+        self.graph.add_sample(temp, hum, self.screen == self.GRAPH)
+
+        reading = (temp, hum, wifi_rssi, ip)
+        if self.screen == self.WEATHER and reading != self.reading:
+            self.display_manager.show_weather_values(temp, hum, wifi_rssi, ip)
+        self.reading = reading
+
+    def update(self):
+        """Switch screens on a button press or when the timer expires"""
+        now = time.ticks_ms()
+        timed_out = (
+            self.interval_ms
+            and time.ticks_diff(now, self.last_switch) > self.interval_ms
+        )
+        if not (self.pressed or timed_out):
+            return False
+
+        self.pressed = False
+        self.last_switch = now
+        self.screen = self.GRAPH if self.screen == self.WEATHER else self.WEATHER
+        self.render()
+        return True
+
+    def render(self):
+        """Fully redraw the current screen"""
+        if self.screen == self.GRAPH:
+            self.graph.render()
+        elif self.reading:
+            self.display_manager.show_weather_values(*self.reading)
@@ -0,0 +1,124 @@
+# Dual-core execution: sensor and display work on core 1
+import _thread
+import time
+
+
+class SharedReading:
+    """Lock-protected, double-buffered sensor snapshot shared between cores"""
+
+    def __init__(self):
+        self.lock = _thread.allocate_lock()
+        self.buffers = ([0.0, 0.0, 0], [0.0, 0.0, 0])  # temp, hum, seq
+        self.front = 0
+        self.seq = 0
+        self.network_status = (-100, None)  # rssi, ip
+
+    def publish(self, temp, hum):
+        """Write a new reading (core 1 only)"""
+        # Readers only touch the front buffer under the lock, so the back
+        # buffer can be filled without holding it
+        back = self.buffers[1 - self.front]
+        self.seq += 1
+        back[0] = temp
+        back[1] = hum
+        back[2] = self.seq
+        with self.lock:
+            self.front = 1 - self.front
+
+    def read(self):
+        """Return the latest (temp, hum, seq) without waiting on the sensor"""
+        with self.lock:
+            front = self.buffers[self.front]
+            return front[0], front[1], front[2]
+
+    def set_network(self, rssi, ip):
+        """Store WiFi status (core 0 only, the radio is not safe on core 1)"""
+        with self.lock:
+            self.network_status = (rssi, ip)
+
+    def network(self):
+        """Return the last (rssi, ip) stored by core 0"""
+        with self.lock:
+            return self.network_status
+
+
+class CoreLoad:
+    """Busy-time accounting for one core, readable from the other"""
+
+    def __init__(self):
+        self.lock = _thread.allocate_lock()
+        self.busy_us = 0
+        self.window_start = time.ticks_us()
+        self._start = 0
+
+    def begin(self):
+        """Mark the start of busy work"""
+        self._start = time.ticks_us()
+
+    def end(self):
+        """Mark the end of busy work"""
+        busy = time.ticks_diff(time.ticks_us(), self._start)
+        with self.lock:
+            self.busy_us += busy
+
+    def utilisation(self):
+        """Return busy fraction since the last call and start a new window"""
+        with self.lock:
+            now = time.ticks_us()
+            elapsed = time.ticks_diff(now, self.window_start)
+            busy = self.busy_us
+            self.busy_us = 0
+            self.window_start = now
+        return min(busy / elapsed, 1.0) if elapsed > 0 else 0.0
+
+
+class SensorDisplayWorker:
+    """Samples the DHT22 and refreshes the OLED on core 1"""
+
+    def __init__(self, sensor, carousel, shared, interval_ms=5000, tick_ms=50):
+        self.sensor = sensor
+        self.carousel = carousel
+        self.shared = shared
+        self.interval_ms = interval_ms
+        self.tick_ms = tick_ms
+        self.load = CoreLoad()
+        self.errors = 0
+        self.memory_errors = 0  # Polled by core 0, which owns the MemoryManager
+        self.running = False
+
+    def start(self):
+        """Start the worker loop on core 1"""
+        self.running = True
+        _thread.start_new_thread(self._run, ())
+
+    def stop(self):
+        """Ask the worker loop to exit after the current cycle"""
+        self.running = False
+
+    def _run(self):
+        last_sample = time.ticks_add(time.ticks_ms(), -self.interval_ms)
+        while self.running:
+            self.load.begin()
+            # An uncaught error would end the thread and freeze the snapshot
+            try:
+                if time.ticks_diff(time.ticks_ms(), last_sample) >= self.interval_ms:
+                    last_sample = time.ticks_ms()
+                    self.sensor.measure()
+                    temp = self.sensor.temperature()
+                    hum = self.sensor.humidity()
+                    self.shared.publish(temp, hum)
+
+                    rssi, ip = self.shared.network()
+                    self.carousel.add_reading(temp, hum, rssi, ip)
+
+                # Poll the carousel between samples so button presses feel prompt
+                self.carousel.update()
+            except MemoryError:
+                # Core 0 reports it and runs the recovery
+                self.memory_errors += 1
+            except Exception as e:
+                # The LED is driven through the WiFi chip, so core 0 reports
+                self.errors += 1
+                print("Error on core 1:", e)
+            self.load.end()
+            time.sleep_ms(self.tick_ms)
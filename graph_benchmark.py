@@ -0,0 +1,67 @@
+# Sparkline frame cost: incremental scroll vs full redraw
+# Uses the same OLED wiring as oled_test.py
+
+from machine import Pin, I2C
+from ssd1306 import SSD1306_I2C
+from display_utils import SparklineScreen
+import math
+import time
+
+FRAMES = 50
+
+print("=== Sparkline Benchmark ===")
+
+i2c = I2C(0, sda=Pin(4), scl=Pin(5), freq=400000)
+oled = SSD1306_I2C(128, 64, i2c)
+graph = SparklineScreen(oled)
+
+
+def sample(i):
+    """Synthetic reading that stays inside the plot scale"""
+    return 21.0 + math.sin(i / 8), 50.0 + 5 * math.cos(i / 11)
+
+
+def steady(i):
+    """Reading that moves the plot but keeps the labels at 21.0 and 50.0"""
+    return 21.0 + 0.04 * math.sin(i / 8), 50.0 + 0.04 * math.cos(i / 11)
+
+
+def changing(i):
+    """Reading whose labels change on every frame"""
+    return (21.0, 50.0) if i % 2 else (21.5, 50.5)
+
+
+def time_frames(reading, offset):
+    """Average cost of adding FRAMES visible samples, in microseconds"""
+    start = time.ticks_us()
+    for i in range(FRAMES):
+        graph.add_sample(*reading(offset + i))
+    return time.ticks_diff(time.ticks_us(), start) / FRAMES
+
+
+# Fill the history so both paths draw a full-width plot
+for i in range(graph.PLOT_WIDTH):
+    graph.add_sample(*sample(i), visible=False)
+graph.render()
+
+# Incremental, labels unchanged: scroll one column, push only the plot columns
+graph.add_sample(*steady(0))  # Settle the labels outside the timed loop
+labels = graph.labels
+incremental = time_frames(steady, 1)
+assert graph.labels == labels, "labels changed, plot-only path not timed"
+
+# Incremental, labels changed: scroll one column, push the full width
+label_change = time_frames(changing, 0)
+
+# Full redraw: rebuild every column and push the whole frame
+start = time.ticks_us()
+for i in range(FRAMES):
+    graph.add_sample(*sample(graph.PLOT_WIDTH + i), visible=False)
+    graph.render()
+full = time.ticks_diff(time.ticks_us(), start) / FRAMES
+
+print(f"Incremental (plot only):   {incremental / 1000:.2f} ms/frame")
+print(f"Incremental (with labels): {label_change / 1000:.2f} ms/frame")
+print(f"Full redraw:               {full / 1000:.2f} ms/frame")
+print(f"Speedup (plot only):       {full / incremental:.1f}x")
+print(f"Speedup (with labels):     {full / label_change:.1f}x")
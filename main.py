@@ -6,10 +6,12 @@ import ssd1306
 import sys
 
 # Import our modular components
-from display_utils import DisplayManager
+from display_utils import DisplayManager, ScreenCarousel
 from wifi_manager import WiFiManager
 from led_controller import LEDController
 from web_server import WeatherWebServer
+from memory_manager import MemoryManager
+from dual_core import SharedReading, SensorDisplayWorker, CoreLoad
 
 # Hardware Configuration
 sensor = dht.DHT22(Pin(2))
@@ -17,6 +19,7 @@ i2c = I2C(0, sda=Pin(4), scl=Pin(5), freq=400000)
 oled_display = ssd1306.SSD1306_I2C(128, 64, i2c)
 
 # Initialize managers
+memory = MemoryManager()
 led = LEDController()
 display = DisplayManager(oled_display)
 
@@ -33,6 +36,18 @@ except ImportError:
     print("Please create config.py with SSID and PASSWORD")
     sys.exit()
 
+# Optional: sample and refresh the display on core 1
+try:
+    from config import DUAL_CORE
+except ImportError:
+    DUAL_CORE = False
+
+# Optional: GPIO for a button cycling the OLED screens
+try:
+    from config import BUTTON_PIN
+except ImportError:
+    BUTTON_PIN = None
+
 # Initialize WiFi with display feedback
 wifi = WiFiManager(ssid, password, display, led)
 wifi.scan_networks()
@@ -45,7 +60,7 @@ if not wifi.connect():
 
 # Start web server
 try:
-    web_server = WeatherWebServer(wifi)
+    web_server = WeatherWebServer(wifi, memory)
     web_server.start()
     led.on()  # Solid LED = server running
 except Exception as e:
@@ -53,28 +68,92 @@ except Exception as e:
     led.error_pattern()
     sys.exit()
 
+# Weather and history graph screens
+carousel = ScreenCarousel(display, button_pin=BUTTON_PIN)
+
+# Start core 1 worker
+if DUAL_CORE:
+    shared = SharedReading()
+    shared.set_network(wifi.get_rssi(), wifi.get_ip())
+    worker = SensorDisplayWorker(sensor, carousel, shared)
+    core0_load = CoreLoad()
+    web_server.load = core0_load
+    # Leave core 1 room to allocate while core 0 probes the heap
+    memory.probe_reserve = 8192
+    memory.tracking = False
+    worker.start()
+    print("Dual-core mode: sensor and display on core 1")
+
 # Main monitoring loop
 print("Weather station running...")
 last_update = 0
+last_load_report = time.ticks_ms()
+seen_errors = 0
+seen_memory_errors = 0
+last_seq = 0
+last_seq_change = time.ticks_ms()
+core1_stale = False
 temp = hum = 0.0
 prev_temp = prev_hum = prev_rssi = None
 
 while True:
+    if DUAL_CORE:
+        core0_load.begin()
+
     try:
         current_time = time.ticks_ms()
 
+        if DUAL_CORE:
+            # Core 1 owns the sensor; only the radio is polled here
+            if time.ticks_diff(current_time, last_update) > 5000:
+                shared.set_network(wifi.get_rssi(), wifi.get_ip())
+
+                # No new reading for three intervals means core 1 is stuck
+                stale = time.ticks_diff(current_time, last_seq_change) > 15000
+                if stale and not core1_stale:
+                    print("Core 1 stale: no new reading for 15 s")
+                core1_stale = stale
+
+                if worker.errors != seen_errors or core1_stale:
+                    seen_errors = worker.errors
+                    led.off()
+                    time.sleep(0.05)
+                    led.on()
+                last_update = current_time
+
+            # Report per-core utilisation every 30 seconds
+            if time.ticks_diff(current_time, last_load_report) > 30000:
+                core0 = core0_load.utilisation()
+                core1 = worker.load.utilisation()
+                print(f"Core load: core0={core0 * 100:.1f}%, core1={core1 * 100:.1f}%")
+                last_load_report = current_time
+
+            # Low-memory mode latches here for core 1 MemoryErrors too
+            if worker.memory_errors != seen_memory_errors:
+                seen_memory_errors = worker.memory_errors
+                print("Out of memory on core 1, collecting")
+                memory.on_memory_error()
+
+            temp, hum, seq = shared.read()
+            if seq != last_seq:
+                last_seq = seq
+                last_seq_change = current_time
+
         # Update sensor readings every 5 seconds
-        if time.ticks_diff(current_time, last_update) > 5000:
+        elif time.ticks_diff(current_time, last_update) > 5000:
             try:
-                sensor.measure()
-                temp = sensor.temperature()
-                hum = sensor.humidity()
-                wifi_rssi = wifi.get_rssi()
+                with memory.track("sample"):
+                    sensor.measure()
+                    temp = sensor.temperature()
+                    hum = sensor.humidity()
+                    wifi_rssi = wifi.get_rssi()
+
+                # Graph gets every sample, weather screen redraws on change
+                with memory.track("render"):
+                    carousel.add_reading(temp, hum, wifi_rssi, wifi.get_ip())
 
-                # Update display only if values changed
                 changed = prev_temp != temp or prev_hum != hum or prev_rssi != wifi_rssi
                 if changed:
-                    display.show_weather_data(temp, hum, wifi_rssi, wifi.wlan)
                     print(
                         f"Updated: temp={temp:.1f}°C, hum={hum:.1f}%, rssi={wifi_rssi}dBm"
                     )
@@ -82,15 +161,36 @@ while True:
                 prev_temp, prev_hum, prev_rssi = temp, hum, wifi_rssi
                 last_update = current_time
 
+            except MemoryError:
+                raise  # Handled by the main loop
             except Exception as e:
                 print("Error reading sensor:", e)
                 led.off()
                 time.sleep(0.05)
                 led.on()
 
-        # Handle web requests
-        web_server.handle_request(temp, hum)
+        # Periodic full redraws are the largest render allocation
+        if not DUAL_CORE:
+            with memory.track("render"):
+                carousel.update()
+
+        # Handle web requests, tracked in single-core mode only
+        if DUAL_CORE:
+            web_server.handle_request(temp, hum)
+        else:
+            with memory.track("request"):
+                web_server.handle_request(temp, hum)
 
+        # Collect in the idle slot before the next sample or request
+        memory.idle_collect()
+
+    except MemoryError:
+        print("Out of memory, collecting")
+        memory.on_memory_error()
     except Exception as e:
         print("Error in main loop:", e)
         time.sleep(1)
+
+    # Busy time excludes only the accept wait inside handle_request
+    if DUAL_CORE:
+        core0_load.end()
@@ -0,0 +1,180 @@
+# Memory management and diagnostics
+import gc
+import time
+
+
+class MemoryManager:
+    SUBSYSTEMS = ("sample", "render", "request")
+
+    def __init__(
+        self,
+        gc_threshold=16384,
+        low_memory_bytes=12288,
+        collect_interval_ms=2000,
+        history_interval_ms=60000,
+        history_size=16,
+        low_memory_hold_ms=30000,
+        probe_reserve=0,
+        track_headroom=32768,
+    ):
+        self.low_memory_bytes = low_memory_bytes
+        self.collect_interval_ms = collect_interval_ms
+        self.history_interval_ms = history_interval_ms
+        self.history_size = history_size
+        self.low_memory_hold_ms = low_memory_hold_ms
+        self.probe_reserve = probe_reserve  # Set in dual-core mode only
+        self.track_headroom = track_headroom
+        self.low_memory = False
+        self.low_memory_since = 0
+        self.collections = 0
+        self.memory_errors = 0
+        self.history = []  # (ticks_ms, free, probe_ceiling, largest_free_block)
+        self.allocated = {name: 0 for name in self.SUBSYSTEMS}
+        self.discarded = 0  # Tracked sections not counted, see __enter__
+        self.tracking = True  # Off in dual-core mode, deltas would mix cores
+        self._subsystem = None
+        self._start = None
+
+        # Collect a fixed amount of allocation instead of waiting for the heap
+        # to run dry, so pauses stay short and predictable
+        gc.threshold(gc_threshold)
+        gc.collect()
+        self.last_collect = time.ticks_ms()
+        self.last_record = self.last_collect
+        self._record()
+
+    def track(self, subsystem):
+        """Count bytes allocated in a with-block towards a subsystem"""
+        self._subsystem = subsystem
+        return self
+
+    def __enter__(self):
+        # A collection inside the block would hide its allocation, so hold
+        # automatic collections off, but only while the heap has room
+        if gc.mem_free() >= self.track_headroom:
+            gc.disable()
+            self._start = gc.mem_alloc()
+        else:
+            self._start = None
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._start is None:
+            self.discarded += 1
+        else:
+            self.allocated[self._subsystem] += gc.mem_alloc() - self._start
+            gc.enable()
+        return False
+
+    def idle_collect(self):
+        """Run a collection if one is due, call between samples and requests"""
+        now = time.ticks_ms()
+        if time.ticks_diff(now, self.last_collect) < self.collect_interval_ms:
+            return False
+        self.collect()
+        return True
+
+    def collect(self):
+        """Collect now, record heap stats and update low-memory mode"""
+        gc.collect()
+        self.last_collect = time.ticks_ms()
+        self.collections += 1
+
+        # Probing the largest block is costly, so sample it less often
+        free = gc.mem_free()
+        if (
+            time.ticks_diff(self.last_collect, self.last_record)
+            >= self.history_interval_ms
+        ):
+            self.last_record = self.last_collect
+            self._record()
+
+        if free < self.low_memory_bytes and not self.low_memory:
+            print(f"Low memory: {free} bytes free, degrading")
+            self._enter_low_memory()
+        elif (
+            self.low_memory
+            and free >= self.low_memory_bytes * 2
+            and time.ticks_diff(self.last_collect, self.low_memory_since)
+            >= self.low_memory_hold_ms
+        ):
+            print(f"Memory recovered: {free} bytes free")
+            self.low_memory = False
+
+    def on_memory_error(self):
+        """Recover after a MemoryError in the main loop"""
+        self.memory_errors += 1
+        # Latched for low_memory_hold_ms, a collection alone is no recovery
+        self._enter_low_memory()
+        self.collect()
+
+    def _enter_low_memory(self):
+        self.low_memory = True
+        self.low_memory_since = time.ticks_ms()
+
+    def probe_ceiling(self):
+        """Largest size largest_free_block() will probe for"""
+        return max(0, gc.mem_free() - self.probe_reserve)
+
+    def largest_free_block(self, ceiling=None):
+        """Estimate the largest allocatable block by binary search
+
+        Each failed probe makes MicroPython collect before giving up, so
+        this is only run from collect() at history_interval_ms. Probes
+        leave probe_reserve bytes free so core 1 can keep allocating in
+        dual-core mode; the result is capped at probe_ceiling().
+        """
+        low = 0
+        high = self.probe_ceiling() if ceiling is None else ceiling
+        while low < high:
+            size = (low + high + 1) // 2
+            try:
+                block = bytearray(size)
+                del block
+                low = size
+            except MemoryError:
+                high = size - 1
+        return low
+
+    def stats(self):
+        """Return current memory statistics as a dict"""
+        _, _, ceiling, largest = self.history[-1]
+        return {
+            "free": gc.mem_free(),
+            "allocated": gc.mem_alloc(),
+            "largest_free_block": largest,
+            "fragmentation": self._fragmentation(ceiling, largest),
+            "low_memory": self.low_memory,
+            "collections": self.collections,
+            "memory_errors": self.memory_errors,
+            "subsystems": self.allocated if self.tracking else None,
+            "discarded_samples": self.discarded if self.tracking else None,
+            "history": [
+                {
+                    "ticks_ms": ticks,
+                    "free": free,
+                    "largest_free_block": largest,
+                    "fragmentation": self._fragmentation(ceiling, largest),
+                }
+                for ticks, free, ceiling, largest in self.history
+            ],
+        }
+
+    def _record(self):
+        """Append a heap sample to the fragmentation history"""
+        free = gc.mem_free()
+        ceiling = self.probe_ceiling()
+        largest = self.largest_free_block(ceiling)
+        self.history.append((time.ticks_ms(), free, ceiling, largest))
+        if len(self.history) > self.history_size:
+            self.history.pop(0)
+        # The probe allocations leave garbage behind
+        gc.collect()
+
+    @staticmethod
+    def _fragmentation(ceiling, largest):
+        """Fraction of the probed range unusable for a single allocation"""
+        # Measured against the probe ceiling, so a clean heap reads 0
+        if not ceiling:
+            return 0.0
+        return round(1 - largest / ceiling, 3)
@@ -0,0 +1,32 @@
+# Per-client token-bucket rate limiting
+import time
+from collections import OrderedDict
+
+
+class RateLimiter:
+    def __init__(self, rate=2.0, burst=5, max_clients=16):
+        self.rate = rate  # Tokens refilled per second
+        self.burst = burst
+        self.max_clients = max_clients
+        self.clients = OrderedDict()  # ip -> [tokens, last_ms], oldest first
+
+    def allow(self, ip):
+        """Take a token for this client, return False if it is throttled"""
+        now = time.ticks_ms()
+        bucket = self.clients.pop(ip, None)
+        if bucket is None:
+            bucket = [self.burst, now]
+            # Forget the least recently seen client to stay bounded
+            if len(self.clients) >= self.max_clients:
+                del self.clients[next(iter(self.clients))]
+        else:
+            elapsed = time.ticks_diff(now, bucket[1])
+            bucket[0] = min(self.burst, bucket[0] + elapsed * self.rate / 1000)
+            bucket[1] = now
+
+        # Re-inserting moves the client to the most recent end
+        self.clients[ip] = bucket
+        if bucket[0] < 1:
+            return False
+        bucket[0] -= 1
+        return True
@@ -107,6 +107,22 @@ class SSD1306(framebuf.FrameBuffer):
         self.write_cmd(self.pages - 1)
         self.write_data(self.buffer)
 
+    def show_region(self, x0, x1, page0=0, page1=None):
+        # push only columns x0..x1 of pages page0..page1
+        if page1 is None:
+            page1 = self.pages - 1
+        offset = 32 if self.width == 64 else 0
+        self.write_cmd(SET_COL_ADDR)
+        self.write_cmd(x0 + offset)
+        self.write_cmd(x1 + offset)
+        self.write_cmd(SET_PAGE_ADDR)
+        self.write_cmd(page0)
+        self.write_cmd(page1)
+        buf = memoryview(self.buffer)
+        for page in range(page0, page1 + 1):
+            start = page * self.width + x0
+            self.write_data(buf[start : start + x1 - x0 + 1])
+
 
 class SSD1306_I2C(SSD1306):
     def __init__(self, width, height, i2c, addr=0x3C, external_vcc=False):
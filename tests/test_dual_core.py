@@ -0,0 +1,118 @@
+# Host tests for the dual-core reading snapshot, run with: python -m pytest tests
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from dual_core import CoreLoad, SharedReading
+
+WRITES = 20000
+READERS = 3
+
+
+@pytest.fixture(autouse=True)
+def micropython_ticks(monkeypatch):
+    """MicroPython tick helpers used by dual_core, backed by the host clock"""
+    monkeypatch.setattr(
+        time, "ticks_ms", lambda: time.monotonic_ns() // 1000000, raising=False
+    )
+    monkeypatch.setattr(
+        time, "ticks_us", lambda: time.monotonic_ns() // 1000, raising=False
+    )
+    monkeypatch.setattr(time, "ticks_add", lambda t, delta: t + delta, raising=False)
+    monkeypatch.setattr(time, "ticks_diff", lambda new, old: new - old, raising=False)
+
+
+class PausingBuffer(list):
+    """Snapshot buffer that can stop a writer between temp and hum"""
+
+    def __init__(self, values):
+        super().__init__(values)
+        self.armed = False
+        self.paused = threading.Event()
+        self.resume = threading.Event()
+
+    def __setitem__(self, index, value):
+        super().__setitem__(index, value)
+        if index == 0 and self.armed:
+            self.armed = False
+            self.paused.set()
+            self.resume.wait(5)
+
+
+def test_read_during_publish_returns_previous_snapshot():
+    shared = SharedReading()
+    shared.buffers = tuple(PausingBuffer(buf) for buf in shared.buffers)
+    shared.publish(1.0, 1.0)
+
+    for buf in shared.buffers:
+        buf.armed = True
+    writer = threading.Thread(target=shared.publish, args=(2.0, 2.0))
+    writer.start()
+    try:
+        assert any(buf.paused.wait(5) for buf in shared.buffers)
+        # The writer has set temp but not hum or seq
+        assert shared.read() == (1.0, 1.0, 1)
+    finally:
+        for buf in shared.buffers:
+            buf.resume.set()
+        writer.join(5)
+
+    assert not writer.is_alive()
+    assert shared.read() == (2.0, 2.0, 2)
+
+
+def test_shared_reading_has_no_torn_reads():
+    shared = SharedReading()
+    failures = []
+
+    def writer():
+        for i in range(1, WRITES + 1):
+            shared.publish(i, i)
+
+    def reader():
+        last_seq = 0
+        while last_seq < WRITES:
+            temp, hum, seq = shared.read()
+            if not temp == hum == seq:
+                failures.append(f"torn read: temp={temp}, hum={hum}, seq={seq}")
+            if seq < last_seq:
+                failures.append(f"seq went backwards: {last_seq} -> {seq}")
+            last_seq = seq
+
+    # Switch threads as often as possible so writes and reads interleave
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        threads = [threading.Thread(target=writer)]
+        threads += [threading.Thread(target=reader) for _ in range(READERS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=60)
+    finally:
+        sys.setswitchinterval(interval)
+
+    assert not any(thread.is_alive() for thread in threads)
+    assert failures == []
+    assert shared.read() == (WRITES, WRITES, WRITES)
+
+
+def test_shared_reading_network_status():
+    shared = SharedReading()
+    assert shared.network() == (-100, None)
+    shared.set_network(-55, "192.168.1.20")
+    assert shared.network() == (-55, "192.168.1.20")
+
+
+def test_core_load_resets_each_window():
+    load = CoreLoad()
+    load.begin()
+    time.sleep(0.02)
+    load.end()
+    assert 0.0 < load.utilisation() <= 1.0
+    assert load.busy_us == 0
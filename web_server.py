@@ -1,9 +1,46 @@
 # Simple web server for weather data
+import json
 import socket
+import time
+
+from rate_limiter import RateLimiter
+
+# Pre-encoded so rejecting a client costs no allocation
+THROTTLED_RESPONSE = (
+    b"HTTP/1.1 429 Too Many Requests\r\n"
+    b"Retry-After: 1\r\n"
+    b"Connection: close\r\n"
+    b"Content-Length: 0\r\n\r\n"
+)
+BUSY_RESPONSE = (
+    b"HTTP/1.1 503 Service Unavailable\r\n"
+    b"Retry-After: 1\r\n"
+    b"Connection: close\r\n"
+    b"Content-Length: 0\r\n\r\n"
+)
 
 class WeatherWebServer:
-    def __init__(self, wifi_manager):
+    def __init__(
+        self,
+        wifi_manager,
+        memory_manager=None,
+        rate_limiter=None,
+        max_connections=2,
+        backlog=4,
+        request_budget_ms=500,
+    ):
         self.wifi_manager = wifi_manager
+        self.memory_manager = memory_manager
+        self.rate_limiter = rate_limiter or RateLimiter()
+        # One handle_request call blocks for at most the accept timeout plus
+        # max_connections * request_budget_ms (1.5 s by default), well
+        # inside the 5 s sample interval
+        self.max_connections = max_connections  # Served per handle_request call
+        self.backlog = backlog  # Listen backlog, and clients left queued per call
+        self.request_budget_ms = request_budget_ms
+        self.stats = {"served": 0, "throttled": 0, "rejected": 0, "timed_out": 0}
+        self.pending = []  # Accepted (client, addr) awaiting service, oldest first
+        self.load = None  # Optional CoreLoad, paused during the accept wait
         self.socket = None
         self.html_template = """<!DOCTYPE html>
 <html>
@@ -22,7 +59,7 @@ class WeatherWebServer:
         self.socket = socket.socket()
         self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         self.socket.bind(addr)
-        self.socket.listen(1)
+        self.socket.listen(self.backlog)
         print(f"HTTP server at http://{self.wifi_manager.get_ip()}:80")
         return True
     
@@ -30,58 +67,142 @@ class WeatherWebServer:
         """Handle incoming web requests (non-blocking)"""
         if not self.socket:
             return
-        
-        self.socket.settimeout(timeout)
+
         try:
-            cl, addr = self.socket.accept()
-            print("Web request from", addr)
-            
-            try:
-                # Read HTTP request with timeout
-                cl.settimeout(2.0)  # Give client time to send request
-                request = cl.recv(1024)
-                
-                if not request:
-                    cl.close()
-                    return
-                    
-                request_str = request.decode("utf-8")
-                
-                # Parse request path
-                request_line = request_str.split("\r\n")[0]
-                path = request_line.split(" ")[1] if len(request_line.split(" ")) > 1 else "/"
-                
-                if path == "/favicon.ico":
-                    # Return 404 for favicon
-                    self._send_404(cl)
+            self._accept_pending(timeout)
+
+            # Serve the oldest clients, the rest wait for the next call
+            for _ in range(min(self.max_connections, len(self.pending))):
+                cl, addr = self.pending.pop(0)
+                self._serve_client(cl, addr, temp, hum)
+
+        except MemoryError:
+            raise  # Handled by the main loop
+        except Exception as e:
+            print(f"Server error: {e}")
+            # Try to restart server if needed
+            self._restart_if_needed()
+
+    def _accept_pending(self, timeout):
+        """Move waiting connections into the pending queue"""
+        # Only wait for a client when none are already queued
+        self.socket.settimeout(0 if self.pending else timeout)
+        try:
+            for i in range(self.max_connections + self.backlog):
+                if i == 0 and self.load:
+                    # Waiting for a client is idle time, not core 0 load
+                    self.load.end()
+                    try:
+                        cl, addr = self.socket.accept()
+                    finally:
+                        self.load.begin()
                 else:
-                    # Serve main page
-                    self._send_weather_page(cl, temp, hum)
-                    
-            except Exception as e:
-                print(f"Error processing request: {e}")
-            finally:
-                try:
-                    cl.close()
-                except:
-                    pass  # Socket may already be closed
-            
+                    cl, addr = self.socket.accept()
+                self.socket.settimeout(0)
+
+                # Answer without reading the request, so neither a flooding
+                # client nor a full queue costs more than one send
+                if not self.rate_limiter.allow(addr[0]):
+                    self.stats["throttled"] += 1
+                    self._send_canned(cl, THROTTLED_RESPONSE)
+                elif len(self.pending) >= self.max_connections + self.backlog:
+                    self.stats["rejected"] += 1
+                    self._send_canned(cl, BUSY_RESPONSE)
+                else:
+                    self.pending.append((cl, addr))
+
         except OSError:
             # No incoming connections (normal for non-blocking)
             pass
+
+    def _serve_client(self, cl, addr, temp, hum):
+        """Serve one client within the per-request time budget"""
+        deadline = time.ticks_add(time.ticks_ms(), self.request_budget_ms)
+        try:
+            print("Web request from", addr)
+            request = self._recv_request(cl, deadline)
+            if request is None:
+                # Slow client, drop it rather than stall the main loop
+                self.stats["timed_out"] += 1
+                return
+            if not request:
+                return
+
+            request_str = request.decode("utf-8")
+
+            # Parse request path
+            request_line = request_str.split("\r\n")[0]
+            path = request_line.split(" ")[1] if len(request_line.split(" ")) > 1 else "/"
+
+            # Responses go out in a single send bounded by what is left
+            cl.settimeout(max(1, time.ticks_diff(deadline, time.ticks_ms())) / 1000)
+
+            if path == "/favicon.ico":
+                # Return 404 for favicon
+                self._send_404(cl)
+            elif path == "/debug/mem" and self.memory_manager:
+                self._send_memory_stats(cl)
+            elif path == "/debug/http":
+                self._send_http_stats(cl)
+            elif self.memory_manager and self.memory_manager.low_memory:
+                # Skip the HTML template while memory is tight
+                self._send_weather_text(cl, temp, hum)
+            else:
+                # Serve main page
+                self._send_weather_page(cl, temp, hum)
+            self.stats["served"] += 1
+
+        except MemoryError:
+            raise  # Handled by the main loop
         except Exception as e:
-            print(f"Server error: {e}")
-            # Try to restart server if needed
-            self._restart_if_needed()
-    
+            print(f"Error processing request: {e}")
+        finally:
+            try:
+                cl.close()
+            except:
+                pass  # Socket may already be closed
+
+    def _recv_request(self, client, deadline):
+        """Read request headers, return None if the deadline passes first"""
+        request = b""
+        while b"\r\n\r\n" not in request and len(request) < 1024:
+            remaining = time.ticks_diff(deadline, time.ticks_ms())
+            if remaining <= 0:
+                return None
+            client.settimeout(remaining / 1000)
+            try:
+                chunk = client.recv(1024 - len(request))
+            except OSError:
+                return None
+            if not chunk:
+                break
+            request += chunk
+        return request
+
+    def _send_canned(self, client, response):
+        """Send a pre-encoded response and close, ignoring slow clients"""
+        try:
+            client.settimeout(0)
+            client.send(response)
+        except OSError:
+            pass
+        finally:
+            try:
+                client.close()
+            except:
+                pass  # Socket may already be closed
+
+    def _send_response(self, client, headers, body):
+        """Send headers and body in one call, so one timeout bounds the write"""
+        client.send((headers + body).encode("utf-8"))
+
     def _send_404(self, client):
         """Send 404 response"""
         error_response = "404 Not Found"
         headers = "HTTP/1.1 404 Not Found\r\n"
         headers += "Connection: close\r\n"
         headers += f"Content-Length: {len(error_response)}\r\n\r\n"
-        client.send(headers.encode("utf-8"))
-        client.send(error_response.encode("utf-8"))
+        self._send_response(client, headers, error_response)
     
     def _send_weather_page(self, client, temp, hum):
         """Send weather data page"""
@@ -92,9 +213,41 @@ class WeatherWebServer:
         headers += "Connection: close\r\n"
         headers += f"Content-Length: {len(response)}\r\n\r\n"
         
-        client.send(headers.encode("utf-8"))
-        client.send(response.encode("utf-8"))
+        self._send_response(client, headers, response)
     
+    def _send_weather_text(self, client, temp, hum):
+        """Send weather data as plain text (low-memory mode)"""
+        response = f"Temp: {temp:.1f} C\nHum: {hum:.1f} %\n"
+        headers = "HTTP/1.1 200 OK\r\n"
+        headers += "Content-Type: text/plain\r\n"
+        headers += "Connection: close\r\n"
+        headers += f"Content-Length: {len(response)}\r\n\r\n"
+
+        self._send_response(client, headers, response)
+
+    def _send_memory_stats(self, client):
+        """Send memory diagnostics as JSON"""
+        response = json.dumps(self.memory_manager.stats())
+        headers = "HTTP/1.1 200 OK\r\n"
+        headers += "Content-Type: application/json\r\n"
+        headers += "Connection: close\r\n"
+        headers += f"Content-Length: {len(response)}\r\n\r\n"
+
+        self._send_response(client, headers, response)
+
+    def _send_http_stats(self, client):
+        """Send request admission counters as JSON"""
+        stats = dict(self.stats)
+        stats["tracked_clients"] = len(self.rate_limiter.clients)
+        stats["queued"] = len(self.pending)
+        response = json.dumps(stats)
+        headers = "HTTP/1.1 200 OK\r\n"
+        headers += "Content-Type: application/json\r\n"
+        headers += "Connection: close\r\n"
+        headers += f"Content-Length: {len(response)}\r\n\r\n"
+
+        self._send_response(client, headers, response)
+
     def _restart_if_needed(self):
         """Restart server if socket is broken"""
         try: